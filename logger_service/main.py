@@ -1,14 +1,30 @@
 # logger_service/main.py
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import json
+import array
+import collections
 import logging
-from logging.handlers import RotatingFileHandler
+import mmap
+import queue
+import re
+import stat
+import struct
+import threading
+import time
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = FastAPI(title="Logger Service", description="Centralized Logging Microservice")
 
 # Configure basic logging system
@@ -26,8 +42,283 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 # Configure different log handlers for different services
 service_loggers = {}
+_creation_lock = threading.Lock()
+
+# Batched writer settings
+FLUSH_INTERVAL = 0.05  # seconds a batch may wait before being written
+FLUSH_THRESHOLD = 64 * 1024  # bytes buffered before a batch is written early
+SYNC_TIMEOUT = 10  # seconds a durable request waits for its fdatasync()
+WRITER_IDLE_TIMEOUT = 20 * FLUSH_INTERVAL  # seconds without wakeups before a writer thread exits
+
+# Layout of a service log line: "<asctime> - <levelname> - <message>"
+SERVICE_LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# ",mmm - " suffix of the timestamp for every millisecond value
+MSECS_SUFFIXES = tuple(f",{msecs:03d} - " for msecs in range(1000))
+
+class LogColumns:
+    """Records waiting to be written, stored column by column
+
+    Each record costs a few appends to flat columns on the emitting thread;
+    formatting happens later, for the whole batch, on the writer thread.
+    A record that was already formatted has level None and its full line
+    in messages.
+    """
+
+    __slots__ = ("created", "msecs", "levels", "messages", "size")
+
+    def __init__(self):
+        self.created = array.array("d")
+        self.msecs = array.array("H")
+        self.levels = []
+        self.messages = []
+        self.size = 0  # approximate number of bytes held
+
+    def __len__(self):
+        return len(self.messages)
+
+class BatchedFileHandler(logging.Handler):
+    """Rotating file handler that buffers records and appends them in batches
+
+    emit() only stores the record in a LogColumns buffer; each handler has
+    its own writer thread, which formats a batch and writes it with a single
+    write(). Different service files are therefore written concurrently.
+    The writer thread exits once the handler has been idle for
+    WRITER_IDLE_TIMEOUT and is started again by the next record.
+    Without a formatter, records are laid out as SERVICE_LOG_FORMAT by
+    format_batch() instead of logging.Formatter.
+    """
+
+    _fallback_formatter = logging.Formatter(SERVICE_LOG_FORMAT)
+
+    def __init__(self, filename, maxBytes=0, backupCount=0):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.maxBytes = maxBytes
+        self.backupCount = backupCount
+        self._fd = None
+        self._size = 0
+        # Set when the directory entry of the log file changed (file created
+        # or rotated), so the next sync also fsync()s the directory
+        self._dir_dirty = False
+        self._pending = LogColumns()
+        self._ready = collections.deque()  # swapped-out batches waiting to be written
+        self._write_lock = threading.Lock()
+        # Wakeups for the writer thread: False when a batch starts, True when
+        # it reaches FLUSH_THRESHOLD, None to stop
+        self._wakeups = queue.SimpleQueue()
+        # Group commit: sync() callers register a generation and wait until
+        # the writer thread has flushed and fdatasync()ed past it
+        self._sync_cond = threading.Condition()
+        self._sync_requested = 0
+        self._sync_done = 0
+        self._sync_failed = 0
+        self._writer = None  # started on demand, see _start_writer()
+
+    def emit(self, record):
+        """Append the record to the pending columns (called under self.lock)"""
+        try:
+            if self.formatter is not None or record.exc_info or record.stack_info:
+                formatter = self.formatter or self._fallback_formatter
+                level = None
+                message = formatter.format(record) + "\n"
+            else:
+                level = record.levelname
+                message = record.getMessage()
+        except Exception:
+            self.handleError(record)
+            return
+
+        pending = self._pending
+        was_empty = not pending.messages
+        before = pending.size
+        pending.created.append(record.created)
+        pending.msecs.append(int(record.msecs))
+        pending.levels.append(level)
+        pending.messages.append(message)
+        pending.size += len(message)
+        if was_empty or before < FLUSH_THRESHOLD <= pending.size:
+            self._start_writer()
+            self._wakeups.put(pending.size >= FLUSH_THRESHOLD)
+
+    @staticmethod
+    def format_batch(pending):
+        """Format pending records into one UTF-8 encoded block of lines
+
+        Each line is assembled from cached pieces (the timestamp is rendered
+        once per second, the milliseconds come from MSECS_SUFFIXES) and the
+        whole batch is joined and encoded in a single call.
+        """
+        parts = []
+        extend = parts.extend
+        append = parts.append
+        last_second = None
+        second_text = ""
+        for created, msecs, level, message in zip(
+            pending.created, pending.msecs, pending.levels, pending.messages
+        ):
+            if level is None:
+                append(message)
+                continue
+            second = int(created)
+            if second != last_second:
+                last_second = second
+                second_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+            extend((second_text, MSECS_SUFFIXES[msecs], level, " - ", message, "\n"))
+        return "".join(parts).encode("utf-8", "backslashreplace")
+
+    def buffered(self):
+        """Approximate number of bytes waiting to be written"""
+        return self._pending.size
+
+    def flush(self):
+        """Write everything buffered so far to the log file"""
+        # Swap the columns out so emit() is not blocked while we write. Batches
+        # are queued in swap order under self.lock, and _write_lock is only
+        # taken afterwards: logging.shutdown() calls flush() while holding
+        # self.lock, so the two locks must never be taken the other way round.
+        with self.lock:
+            if self._pending:
+                self._ready.append(self._pending)
+                self._pending = LogColumns()
+        with self._write_lock:
+            while self._ready:
+                self._write(self.format_batch(self._ready.popleft()))
+
+    def sync(self, timeout=None):
+        """Block until every record emitted so far is written and on disk
+
+        Concurrent callers share the writer thread's next flush and
+        fdatasync(). Returns False if that failed or timed out.
+        """
+        with self._sync_cond:
+            self._sync_requested += 1
+            target = self._sync_requested
+        with self.lock:
+            self._start_writer()
+            self._wakeups.put(True)
+        with self._sync_cond:
+            if not self._sync_cond.wait_for(lambda: self._sync_done >= target, timeout):
+                return False
+            return self._sync_failed < target
+
+    def close(self):
+        with self.lock:
+            if self._writer is not None:
+                self._wakeups.put(None)
+        try:
+            self.flush()
+        finally:
+            with self._write_lock:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+            super().close()
+
+    def _start_writer(self):
+        """Start the writer thread unless it is running (called under self.lock)"""
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name=f"log-writer-{os.path.basename(self.baseFilename)}",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def _writer_loop(self):
+        """Give each batch up to FLUSH_INTERVAL to fill up, then write it"""
+        while True:
+            try:
+                wakeup = self._wakeups.get(timeout=WRITER_IDLE_TIMEOUT)
+            except queue.Empty:
+                # emit() and sync() queue their wakeup under self.lock, so
+                # none can be missed between this check and the exit
+                with self.lock:
+                    if self._wakeups.empty() and not self._pending:
+                        self._writer = None
+                        return
+                continue
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while wakeup is False and (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    wakeup = self._wakeups.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            # Only sync() calls registered before this flush are covered by it
+            with self._sync_cond:
+                sync_target = self._sync_requested
+            failed = False
+            try:
+                self.flush()
+                if sync_target > self._sync_done:
+                    self._datasync()
+            except Exception:
+                failed = True
+                logging.getLogger(__name__).exception("Failed to write log file %s", self.baseFilename)
+            if sync_target > self._sync_done:
+                with self._sync_cond:
+                    if failed:
+                        self._sync_failed = sync_target
+                    self._sync_done = sync_target
+                    self._sync_cond.notify_all()
+            if wakeup is None:
+                return
+
+    def _datasync(self):
+        with self._write_lock:
+            if self._fd is not None:
+                getattr(os, "fdatasync", os.fsync)(self._fd)
+            if self._dir_dirty:
+                # fdatasync() does not cover the file's name in its directory
+                dir_fd = os.open(os.path.dirname(self.baseFilename), os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+                self._dir_dirty = False
+
+    def _write(self, data):
+        if self._fd is None:
+            self._open()
+        # Rotation is decided from the tracked size, so writes never stat()
+        if self._should_rotate(len(data)):
+            self._rotate()
+
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            self._size += written
+            view = view[written:]
+
+    def _should_rotate(self, incoming):
+        if self.maxBytes <= 0 or self.backupCount <= 0 or self._size == 0:
+            return False
+        return self._size + incoming > self.maxBytes
+
+    def _open(self):
+        flags = os.O_WRONLY | os.O_APPEND
+        try:
+            self._fd = os.open(self.baseFilename, flags)
+        except FileNotFoundError:
+            self._fd = os.open(self.baseFilename, flags | os.O_CREAT, 0o644)
+            self._dir_dirty = True
+        self._size = os.fstat(self._fd).st_size
+
+    def _rotate(self):
+        """Shift <file>.1 .. <file>.N-1 up by one and start a new file"""
+        os.close(self._fd)
+        self._fd = None
+        for i in range(self.backupCount - 1, 0, -1):
+            src = f"{self.baseFilename}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.baseFilename}.{i + 1}")
+        os.replace(self.baseFilename, f"{self.baseFilename}.1")
+        self._dir_dirty = True
+        self._open()
 
 class LogEntry(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     service: str
     level: str  # "INFO", "ERROR", "WARNING", "DEBUG"
     message: str
@@ -54,44 +345,88 @@ class LogQuery(BaseModel):
     limit: Optional[int] = 100
     offset: Optional[int] = 0
 
+def get_log_path(service_name):
+    """Path of the log file for a specific service"""
+    return os.path.join(LOG_DIR, f"{service_name}.log")
+
 def get_logger(service_name):
     """Get or create a logger for a specific service"""
-    if service_name not in service_loggers:
+    # Fast path: dict lookups are atomic, so existing loggers need no lock
+    logger = service_loggers.get(service_name)
+    if logger is not None:
+        return logger
+
+    with _creation_lock:
+        # Another request may have created it while we waited for the lock
+        logger = service_loggers.get(service_name)
+        if logger is not None:
+            return logger
+
         logger = logging.getLogger(service_name)
         logger.setLevel(logging.DEBUG)
         
         # Create service-specific log file
-        file_handler = RotatingFileHandler(
-            os.path.join(LOG_DIR, f"{service_name}.log"), 
+        file_handler = BatchedFileHandler(
+            get_log_path(service_name),
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5
         )
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
-        ))
         logger.addHandler(file_handler)
         
         service_loggers[service_name] = logger
     
-    return service_loggers[service_name]
+    return logger
+
+def dumps_details(details):
+    """Serialize log details as compact JSON
+
+    Uses orjson when installed. The json fallback produces the same output
+    and also covers values orjson rejects, such as integers beyond 64 bits.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(details).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(details, separators=(",", ":"), ensure_ascii=False)
+
+# Logger method used for each accepted log level
+LEVEL_METHODS = {
+    "INFO": "info",
+    "ERROR": "error",
+    "WARNING": "warning",
+    "DEBUG": "debug",
+}
 
 def log_to_file(log_entry: LogEntry):
-    """Write log to the corresponding service log file"""
-    logger = get_logger(log_entry.service)
+    """Write log to the corresponding service log file
+
+    Returns False when the entry was dropped because of an unknown level.
+    """
+    method = LEVEL_METHODS.get(log_entry.level.upper())
+    if method is None:
+        # Unknown levels are dropped
+        return False
     
     log_message = log_entry.message
     if log_entry.details:
-        log_message += f" - Details: {json.dumps(log_entry.details)}"
+        log_message += f" - Details: {dumps_details(log_entry.details)}"
     
-    if log_entry.level.upper() == "INFO":
-        logger.info(log_message)
-    elif log_entry.level.upper() == "ERROR":
-        logger.error(log_message)
-    elif log_entry.level.upper() == "WARNING":
-        logger.warning(log_message)
-    elif log_entry.level.upper() == "DEBUG":
-        logger.debug(log_message)
+    getattr(get_logger(log_entry.service), method)(log_message)
+    return True
+
+def sync_service_log(service_name):
+    """Wait until everything logged for a service is on disk"""
+    for handler in get_logger(service_name).handlers:
+        if isinstance(handler, BatchedFileHandler) and not handler.sync(timeout=SYNC_TIMEOUT):
+            return False
+    return True
+
+def log_batch_to_file(log_entries: List[LogEntry]):
+    """Write a batch of logs, each to its service log file"""
+    for log_entry in log_entries:
+        log_to_file(log_entry)
 
 def log_info(message: str, service: str):
     """Simplified logging function for recording INFO level logs"""
@@ -99,34 +434,237 @@ def log_info(message: str, service: str):
     logger.info(message)
     return True
 
-@app.post("/log", response_model=dict)
-async def create_log(log_entry: LogEntry, background_tasks: BackgroundTasks):
+# Fixed-width binary log records: timestamp (signed ns since the epoch),
+# level, message length, message
+BINARY_RECORD = struct.Struct("<qBH245s")
+BINARY_MESSAGE_SIZE = 245
+BINARY_LEVEL_OFFSET = 8  # byte offset of the level inside a record
+BINARY_LEVEL_IDS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+BINARY_LEVEL_NAMES = {level_id: name for name, level_id in BINARY_LEVEL_IDS.items()}
+
+# Append-only descriptors of binary log files, keyed by path
+binary_log_fds = {}
+
+def get_binary_log_path(service_name):
+    """Path of the binary log file for a specific service"""
+    return os.path.join(LOG_DIR, f"{service_name}.bin")
+
+def get_binary_log_fd(log_file):
+    """Get or open the append-only descriptor of a binary log file"""
+    fd = binary_log_fds.get(log_file)
+    if fd is not None:
+        return fd
+
+    with _creation_lock:
+        fd = binary_log_fds.get(log_file)
+        if fd is None:
+            fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            binary_log_fds[log_file] = fd
+    return fd
+
+def binary_timestamp_ns(timestamp):
+    """Nanoseconds since the epoch for a binary record, at microsecond precision
+
+    Raises ValueError when the timestamp does not fit the signed 64-bit
+    field (roughly years 1678 to 2262).
+    """
+    try:
+        seconds = timestamp.timestamp()
+    except (OverflowError, OSError) as e:
+        raise ValueError(f"Timestamp out of range: {e}")
+    timestamp_ns = int(seconds * 1_000_000) * 1000
+    if not -2**63 <= timestamp_ns < 2**63:
+        raise ValueError("Timestamp out of range for a binary log record")
+    return timestamp_ns
+
+def log_to_binary_file(log_entry: LogEntry):
+    """Append a log entry to the service binary log as one fixed-width record
+
+    Only the timestamp, level and message are stored; messages longer than
+    BINARY_MESSAGE_SIZE bytes are truncated.
+    """
+    level_id = BINARY_LEVEL_IDS.get(log_entry.level.upper())
+    if level_id is None:
+        # Unknown levels are dropped
+        return
+    
+    message = log_entry.message.encode("utf-8")[:BINARY_MESSAGE_SIZE]
+    timestamp_ns = binary_timestamp_ns(log_entry.timestamp or datetime.now())
+    record = BINARY_RECORD.pack(timestamp_ns, level_id, len(message), message)
+    # A single write() per record, so O_APPEND never interleaves records
+    os.write(get_binary_log_fd(get_binary_log_path(log_entry.service)), record)
+
+def decode_binary_record(buffer, index):
+    """Decode the record at index of a binary log into a JSON-ready dict"""
+    timestamp_ns, level_id, length, message = BINARY_RECORD.unpack_from(buffer, index * BINARY_RECORD.size)
+    return {
+        "timestamp": (
+            datetime.fromtimestamp(timestamp_ns // 1_000_000_000)
+            + timedelta(microseconds=timestamp_ns % 1_000_000_000 // 1000)
+        ).isoformat(),
+        "level": BINARY_LEVEL_NAMES.get(level_id, str(level_id)),
+        # Truncation may have split a multi-byte character
+        "message": message[:length].decode("utf-8", "ignore"),
+    }
+
+# Leading "YYYY-MM-DD HH:MM:SS,mmm" of a line written by the service formatter
+LOG_TIMESTAMP_RE = re.compile(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}")
+LOG_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_TIMESTAMP_LENGTH = 23
+
+def _parse_time_bound(name, value):
+    """Convert an ISO 8601 query parameter to the log file timestamp format"""
+    try:
+        bound = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+    if bound.tzinfo is not None:
+        # Log files are written in local time
+        bound = bound.astimezone().replace(tzinfo=None)
+    return f"{bound.strftime(LOG_TIMESTAMP_FORMAT)},{bound.microsecond // 1000:03d}"
+
+def build_log_filter(level=None, start_time=None, end_time=None):
+    """Compile the query filters into one predicate over log lines
+
+    Returns None when no filter is requested. Timestamps are compared as
+    strings down to the millisecond, which orders correctly for the
+    fixed-width log timestamp.
+    """
+    checks = []
+    if level:
+        level_token = f" - {level.upper()} - "
+        checks.append(lambda line: level_token in line)
+    if start_time or end_time:
+        start = _parse_time_bound("start_time", start_time) if start_time else None
+        end = _parse_time_bound("end_time", end_time) if end_time else None
+
+        def in_time_range(line):
+            if not LOG_TIMESTAMP_RE.match(line):
+                return False
+            timestamp = line[:LOG_TIMESTAMP_LENGTH]
+            return (start is None or timestamp >= start) and (end is None or timestamp <= end)
+        checks.append(in_time_range)
+
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda line: all(check(line) for check in checks)
+
+def parse_body(body: bytes, model):
+    """Parse and validate a JSON request body in a single pydantic-core call
+
+    Errors are raised as RequestValidationError so they produce the same
+    422 response FastAPI gives for its own body parsing.
+    """
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+
+def body_schema(model):
+    """OpenAPI requestBody for endpoints that parse their body with parse_body"""
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    # Inline nested models, since this schema is not registered as a component
+    def inline(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return inline(definitions[ref[len("#/$defs/"):]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    schema = inline(schema)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
+
+# Success bodies are constant (apart from the count), so encode them once
+SUCCESS_BODY = b'{"status":"success"}'
+SUCCESS_COUNT_PREFIX = b'{"status":"success","count":'
+
+def success_response(count=None):
+    """JSON success response, optionally with the number of logs recorded"""
+    body = SUCCESS_BODY if count is None else b"%s%d}" % (SUCCESS_COUNT_PREFIX, count)
+    return Response(content=body, media_type="application/json")
+
+@app.post("/log", response_model=dict, openapi_extra=body_schema(LogEntry))
+async def create_log(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    durable: bool = Query(False, description="Only respond once the log is on disk")
+):
     """Record a log entry"""
+    log_entry = parse_body(await request.body(), LogEntry)
     if not log_entry.timestamp:
         log_entry.timestamp = datetime.now()
     
     log_id = str(uuid.uuid4())
     
+    if durable:
+        # Concurrent durable requests share a single fdatasync() per flush
+        # Nothing to sync for a dropped entry; syncing would create its logger
+        logged = await run_in_threadpool(log_to_file, log_entry)
+        if logged and not await run_in_threadpool(sync_service_log, log_entry.service):
+            raise HTTPException(status_code=503, detail="Log could not be written to disk")
+        return success_response()
+    
     # Use background tasks to write logs to avoid blocking API response
     background_tasks.add_task(log_to_file, log_entry)
     
     # Modified return format for compatibility with tests
-    return {
-        "status": "success"
-    }
+    return success_response()
+
+@app.post("/log/binary", response_model=dict, openapi_extra=body_schema(LogEntry))
+async def create_binary_log(request: Request, background_tasks: BackgroundTasks):
+    """Record a log entry as a fixed-width binary record"""
+    log_entry = parse_body(await request.body(), LogEntry)
+    if not log_entry.timestamp:
+        log_entry.timestamp = datetime.now()
+    
+    # Reject what the record cannot hold now, rather than dropping it in the background
+    try:
+        binary_timestamp_ns(log_entry.timestamp)
+    except ValueError as e:
+        raise RequestValidationError([{
+            "type": "value_error",
+            "loc": ("body", "timestamp"),
+            "msg": str(e),
+            "input": log_entry.timestamp.isoformat(),
+        }])
+    
+    background_tasks.add_task(log_to_binary_file, log_entry)
+    
+    return success_response()
 
-@app.post("/log/batch", response_model=dict)
-async def create_logs_batch(request: LogBatchRequest, background_tasks: BackgroundTasks):
+@app.post("/log/batch", response_model=LogBatchResponse, openapi_extra=body_schema(LogBatchRequest))
+async def create_logs_batch(request: Request, background_tasks: BackgroundTasks):
     """Batch record multiple log entries"""
-    for log_entry in request.logs:
+    batch = parse_body(await request.body(), LogBatchRequest)
+    # Entries of one batch arrive together, so they share a single timestamp
+    received_at = datetime.now()
+    for log_entry in batch.logs:
         if not log_entry.timestamp:
-            log_entry.timestamp = datetime.now()
-        background_tasks.add_task(log_to_file, log_entry)
+            log_entry.timestamp = received_at
+    # One background task for the whole batch rather than a threadpool hop per entry
+    background_tasks.add_task(log_batch_to_file, batch.logs)
     
-    return {
-        "status": "success",
-        "count": len(request.logs)
-    }
+    return success_response(len(batch.logs))
 
 @app.get("/logs/{service_name}")
 async def get_logs(
@@ -138,30 +676,134 @@ async def get_logs(
     offset: int = 0
 ):
     """Get logs for a specific service"""
+    log_filter = build_log_filter(level, start_time, end_time)
     try:
-        log_file = os.path.join(LOG_DIR, f"{service_name}.log")
-        if not os.path.exists(log_file):
+        # Open directly instead of checking os.path.exists() first, which
+        # would cost an extra stat() on every request
+        try:
+            f = open(get_log_path(service_name), "r")
+        except FileNotFoundError:
             return {"logs": [], "total": 0}
         
-        # Read and parse log file
-        logs = []
-        with open(log_file, "r") as f:
-            for line in f:
-                # Parse log line
-                # This needs to be adjusted according to your log format
-                logs.append(line.strip())
+        with f:
+            lines = f if log_filter is None else filter(log_filter, f)
+            if offset < 0 or limit < 0:
+                # Negative values keep their list slice meaning, which needs
+                # every matching line
+                filtered_logs = list(lines)
+                total = len(filtered_logs)
+                paginated_logs = [line.strip() for line in filtered_logs[offset:offset+limit]]
+            else:
+                # Filter, count and paginate in one pass over the file; only
+                # lines on the requested page are stripped and kept
+                total = 0
+                paginated_logs = []
+                for line in lines:
+                    if offset <= total < offset + limit:
+                        paginated_logs.append(line.strip())
+                    total += 1
         
-        # Apply filter conditions
-        filtered_logs = logs
-        if level:
-            filtered_logs = [log for log in filtered_logs if level in log]
+        return {
+            "logs": paginated_logs,
+            "total": total
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving logs: {str(e)}")
+
+def iter_log_file(f, size, tail=None, chunk_size=64 * 1024):
+    """Yield the first `size` bytes of an open log file
+
+    The file keeps growing while it is streamed, so reading stops at the
+    size taken when the response started. With tail, only the last `tail`
+    of those bytes are sent, starting at a line boundary.
+    """
+    with f:
+        if tail is not None and tail < size:
+            # Land on the byte before the tail and skip the partial line
+            f.seek(size - tail - 1)
+            f.readline()
+        remaining = size - f.tell()
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+@app.get("/logs/{service_name}/raw")
+async def get_raw_logs(
+    service_name: str,
+    tail: Optional[int] = Query(None, ge=0, description="Only return the last N bytes")
+):
+    """Get the raw log file of a specific service as plain text"""
+    try:
+        f = open(get_log_path(service_name), "rb")
+    except (FileNotFoundError, IsADirectoryError):
+        raise HTTPException(status_code=404, detail=f"No logs found for service: {service_name}")
+    
+    file_stat = os.fstat(f.fileno())
+    if not stat.S_ISREG(file_stat.st_mode):
+        f.close()
+        raise HTTPException(status_code=404, detail=f"No logs found for service: {service_name}")
+    
+    # Served straight from the file, without going through JSON encoding
+    headers = None
+    if tail is None:
+        # The body is exactly the size at open time, however much is appended meanwhile
+        headers = {"Content-Length": str(file_stat.st_size)}
+    return StreamingResponse(
+        iter_log_file(f, file_stat.st_size, tail),
+        media_type="text/plain",
+        headers=headers,
+    )
+
+@app.get("/logs/{service_name}/binary")
+async def get_binary_logs(
+    service_name: str,
+    level: Optional[str] = None,
+    limit: int = Query(100, ge=0),
+    offset: int = Query(0, ge=0)
+):
+    """Get logs for a specific service from its binary log"""
+    level_id = None
+    if level:
+        level_id = BINARY_LEVEL_IDS.get(level.upper())
+        if level_id is None:
+            raise HTTPException(status_code=400, detail=f"Invalid level: {level}")
+    
+    try:
+        try:
+            f = open(get_binary_log_path(service_name), "rb")
+        except FileNotFoundError:
+            return {"logs": [], "total": 0}
         
-        # Apply pagination
-        paginated_logs = filtered_logs[offset:offset+limit]
+        with f:
+            # Ignore a trailing partial record
+            count = os.fstat(f.fileno()).st_size // BINARY_RECORD.size
+            if count == 0:
+                return {"logs": [], "total": 0}
+            
+            with mmap.mmap(f.fileno(), count * BINARY_RECORD.size, access=mmap.ACCESS_READ) as mm:
+                if level_id is None:
+                    total = count
+                    indices = range(offset, min(offset + limit, count))
+                else:
+                    # The level byte of every record, gathered in one strided slice
+                    levels = mm[BINARY_LEVEL_OFFSET::BINARY_RECORD.size]
+                    level_byte = bytes([level_id])
+                    total = levels.count(level_byte)
+                    indices = []
+                    index = -1
+                    for _ in range(min(offset + limit, total)):
+                        index = levels.find(level_byte, index + 1)
+                        indices.append(index)
+                    indices = indices[offset:]
+                
+                logs = [decode_binary_record(mm, index) for index in indices]
         
         return {
-            "logs": paginated_logs,
-            "total": len(filtered_logs)
+            "logs": logs,
+            "total": total
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving logs: {str(e)}")
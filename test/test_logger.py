@@ -3,14 +3,18 @@ import pytest
 import os
 import tempfile
 import shutil
+import stat
 from unittest.mock import patch, MagicMock, mock_open
 from fastapi.testclient import TestClient
 from datetime import datetime
 import json
+import logging
+import threading
+import time
 import uuid
 
 # Import the app and functions
-from logger_service.main import app, get_logger, log_to_file, log_info, LogEntry
+from logger_service.main import app, get_logger, log_to_file, log_info, LogEntry, BatchedFileHandler, iter_log_file
 
 class TestLoggerService:
     
@@ -25,11 +29,22 @@ class TestLoggerService:
             self.client = TestClient(app)
             yield
         
-        # Cleanup
+        # Close the handlers and descriptors opened during the test first, so
+        # no writer thread is left flushing into the removed directory
+        from logger_service.main import service_loggers, binary_log_fds
+        for logger in service_loggers.values():
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+        for fd in binary_log_fds.values():
+            os.close(fd)
+        binary_log_fds.clear()
+        
+        # Cleanup (shutil.rmtree already walks with os.scandir and unlinks
+        # relative to directory fds on Linux)
         shutil.rmtree(self.temp_dir, ignore_errors=True)
         
         # Clear service_loggers cache
-        from logger_service.main import service_loggers
         service_loggers.clear()
 
     def test_health_check(self):
@@ -64,6 +79,215 @@ class TestLoggerService:
             logger2 = get_logger("existing_service")
             assert logger1 is logger2
 
+    def test_batched_file_handler_writes_on_flush(self):
+        """Test that buffered records reach the file once flushed"""
+        log_file = os.path.join(self.temp_dir, "batched.log")
+        handler = BatchedFileHandler(log_file)
+        handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+        logger = logging.getLogger("batched_test")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            logger.info("First message")
+            logger.error("Second message")
+            handler.flush()
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        with open(log_file) as f:
+            assert f.read() == "INFO - First message\nERROR - Second message\n"
+
+    def test_batched_file_handler_flush_under_handler_lock(self):
+        """Test flush()/close() while holding the handler lock, as logging.shutdown() does"""
+        log_file = os.path.join(self.temp_dir, "shutdown.log")
+        handler = BatchedFileHandler(log_file)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+        def shutdown():
+            handler.handle(logging.makeLogRecord({"msg": "Pending record"}))
+            handler.acquire()
+            try:
+                # Have the writer thread start a flush while we hold the lock
+                handler._wakeups.put(True)
+                deadline = time.monotonic() + 0.5
+                while not handler._write_lock.locked() and time.monotonic() < deadline:
+                    time.sleep(0.001)
+                handler.flush()
+                handler.close()
+            finally:
+                handler.release()
+
+        thread = threading.Thread(target=shutdown, daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+        assert not thread.is_alive(), "flush()/close() deadlocked with the writer thread"
+
+        with open(log_file) as f:
+            assert f.read() == "Pending record\n"
+
+    def test_batched_file_handler_rotation(self):
+        """Test that the handler rotates the file once maxBytes is exceeded"""
+        log_file = os.path.join(self.temp_dir, "rotating.log")
+        handler = BatchedFileHandler(log_file, maxBytes=10, backupCount=2)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        try:
+            for message in ("first batch", "second batch", "third batch"):
+                handler.handle(logging.makeLogRecord({"msg": message}))
+                handler.flush()
+        finally:
+            handler.close()
+
+        with open(log_file) as f:
+            assert f.read() == "third batch\n"
+        with open(log_file + ".1") as f:
+            assert f.read() == "second batch\n"
+        with open(log_file + ".2") as f:
+            assert f.read() == "first batch\n"
+
+    def test_batched_file_handler_rotation_skips_empty_file(self):
+        """Test that a batch larger than maxBytes is not rotated into an empty backup"""
+        log_file = os.path.join(self.temp_dir, "oversized.log")
+        handler = BatchedFileHandler(log_file, maxBytes=10, backupCount=2)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        try:
+            handler.handle(logging.makeLogRecord({"msg": "much longer than ten bytes"}))
+            handler.flush()
+        finally:
+            handler.close()
+
+        with open(log_file) as f:
+            assert f.read() == "much longer than ten bytes\n"
+        assert not os.path.exists(log_file + ".1")
+
+    def test_batched_file_handler_default_format(self):
+        """Test the built-in '<asctime> - <levelname> - <message>' layout"""
+        log_file = os.path.join(self.temp_dir, "default_format.log")
+        handler = BatchedFileHandler(log_file)
+        record = logging.makeLogRecord({
+            "msg": "Message %s",
+            "args": ("body",),
+            "levelname": "WARNING",
+            "created": datetime(2023, 1, 1, 10, 0, 0).timestamp(),
+            "msecs": 42,
+        })
+        try:
+            handler.handle(record)
+            handler.flush()
+        finally:
+            handler.close()
+
+        with open(log_file) as f:
+            assert f.read() == "2023-01-01 10:00:00,042 - WARNING - Message body\n"
+
+    def test_batched_file_handler_writer_thread(self):
+        """Test that the handler's writer thread writes a batch without an explicit flush"""
+        log_file = os.path.join(self.temp_dir, "background.log")
+        handler = BatchedFileHandler(log_file)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        try:
+            handler.handle(logging.makeLogRecord({"msg": "Written in background"}))
+            deadline = time.monotonic() + 5
+            while not (os.path.exists(log_file) and os.path.getsize(log_file)) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            with open(log_file) as f:
+                assert f.read() == "Written in background\n"
+        finally:
+            handler.close()
+        
+        handler._writer.join(timeout=5)
+        assert not handler._writer.is_alive()
+
+    def test_batched_file_handler_writer_thread_idle_exit(self):
+        """Test that an idle handler's writer thread exits and the next record restarts it"""
+        log_file = os.path.join(self.temp_dir, "idle.log")
+        handler = BatchedFileHandler(log_file)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        try:
+            assert handler._writer is None
+            with patch('logger_service.main.WRITER_IDLE_TIMEOUT', 0.1):
+                handler.handle(logging.makeLogRecord({"msg": "Record 1"}))
+                writer = handler._writer
+                assert writer.is_alive()
+                writer.join(timeout=5)
+                assert not writer.is_alive()
+                assert handler._writer is None
+                
+                handler.handle(logging.makeLogRecord({"msg": "Record 2"}))
+                assert handler._writer is not None and handler._writer is not writer
+                assert handler.sync(timeout=5)
+            
+            with open(log_file) as f:
+                assert f.read() == "Record 1\nRecord 2\n"
+        finally:
+            handler.close()
+
+    def test_batched_file_handler_sync_group_commit(self):
+        """Test that sync() calls arriving during an fdatasync() share the next one"""
+        log_file = os.path.join(self.temp_dir, "synced.log")
+        handler = BatchedFileHandler(log_file)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        first_sync_started = threading.Event()
+        release_first_sync = threading.Event()
+        results = []
+        real_fdatasync = os.fdatasync
+
+        def fdatasync(fd):
+            if not first_sync_started.is_set():
+                first_sync_started.set()
+                release_first_sync.wait(timeout=5)
+            real_fdatasync(fd)
+
+        def worker(index):
+            handler.handle(logging.makeLogRecord({"msg": f"Record {index}"}))
+            results.append(handler.sync(timeout=5))
+
+        try:
+            with patch('logger_service.main.os.fdatasync', side_effect=fdatasync) as mock_fdatasync:
+                threads = [threading.Thread(target=worker, args=(0,))]
+                threads[0].start()
+                assert first_sync_started.wait(timeout=5)
+                
+                # The other callers register while the first fdatasync() is blocked
+                threads += [threading.Thread(target=worker, args=(i,)) for i in range(1, 8)]
+                for thread in threads[1:]:
+                    thread.start()
+                deadline = time.monotonic() + 5
+                while handler._sync_requested < 8 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                release_first_sync.set()
+                for thread in threads:
+                    thread.join()
+                
+                assert results == [True] * 8
+                assert mock_fdatasync.call_count == 2
+            
+            with open(log_file) as f:
+                assert sorted(f.read().splitlines()) == [f"Record {i}" for i in range(8)]
+        finally:
+            release_first_sync.set()
+            handler.close()
+
+    def test_get_logger_concurrent_creation(self):
+        """Test that concurrent first calls create a single logger and handler"""
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(get_logger("concurrent_service"))
+
+        with patch('logger_service.main.service_loggers', {}):
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert all(logger is results[0] for logger in results)
+        assert len(results[0].handlers) == 1
+
     @patch('logger_service.main.get_logger')
     def test_log_to_file_info_level(self, mock_get_logger):
         """Test logging INFO level message"""
@@ -80,7 +304,44 @@ class TestLoggerService:
         log_to_file(log_entry)
         
         mock_get_logger.assert_called_once_with("test_service")
-        mock_logger.info.assert_called_once_with('Test info message - Details: {"key": "value"}')
+        mock_logger.info.assert_called_once_with('Test info message - Details: {"key":"value"}')
+
+    @patch('logger_service.main.orjson', None)
+    @patch('logger_service.main.get_logger')
+    def test_log_to_file_details_without_orjson(self, mock_get_logger):
+        """Test the json fallback serializes details exactly like orjson"""
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        
+        log_entry = LogEntry(
+            service="test_service",
+            level="INFO",
+            message="Test info message",
+            details={"key": "value", "nested": {"list": [1, 2]}, "text": "caf\u00e9"}
+        )
+        
+        log_to_file(log_entry)
+        
+        mock_logger.info.assert_called_once_with(
+            'Test info message - Details: {"key":"value","nested":{"list":[1,2]},"text":"caf\u00e9"}'
+        )
+
+    @patch('logger_service.main.get_logger')
+    def test_log_to_file_details_with_big_integer(self, mock_get_logger):
+        """Test details orjson cannot encode (integers beyond 64 bits) fall back to json"""
+        mock_logger = MagicMock()
+        mock_get_logger.return_value = mock_logger
+        
+        log_entry = LogEntry(
+            service="test_service",
+            level="INFO",
+            message="Test info message",
+            details={"n": 1180591620717411303424}
+        )
+        
+        log_to_file(log_entry)
+        
+        mock_logger.info.assert_called_once_with('Test info message - Details: {"n":1180591620717411303424}')
 
     @patch('logger_service.main.get_logger')
     def test_log_to_file_error_level(self, mock_get_logger):
@@ -142,9 +403,10 @@ class TestLoggerService:
             message="Test unknown level message"
         )
         
-        log_to_file(log_entry)
+        assert log_to_file(log_entry) is False
         
-        # None of the logging methods should be called
+        # No logger (and log file) is created, and no logging method is called
+        mock_get_logger.assert_not_called()
         mock_logger.info.assert_not_called()
         mock_logger.error.assert_not_called()
         mock_logger.warning.assert_not_called()
@@ -178,6 +440,79 @@ class TestLoggerService:
         data = response.json()
         assert data["status"] == "success"
 
+    def test_create_log_endpoint_durable(self):
+        """Test POST /log?durable=true writes the log before responding"""
+        log_data = {
+            "service": "durable_service",
+            "level": "INFO",
+            "message": "Durable message"
+        }
+        
+        response = self.client.post("/log?durable=true", json=log_data)
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "success"
+        with open(os.path.join(self.temp_dir, "durable_service.log")) as f:
+            assert f.read().endswith(" - INFO - Durable message\n")
+
+    def test_create_log_endpoint_durable_syncs_directory(self):
+        """Test the first durable write also fsyncs the directory of the new file"""
+        synced_directories = []
+        real_fsync = os.fsync
+
+        def fsync(fd):
+            fd_stat = os.fstat(fd)
+            if stat.S_ISDIR(fd_stat.st_mode):
+                synced_directories.append(os.path.samestat(fd_stat, os.stat(self.temp_dir)))
+            real_fsync(fd)
+
+        log_data = {
+            "service": "durable_new_service",
+            "level": "INFO",
+            "message": "Durable message"
+        }
+        
+        with patch('logger_service.main.os.fsync', side_effect=fsync):
+            response = self.client.post("/log?durable=true", json=log_data)
+            assert response.status_code == 200
+            assert synced_directories == [True]
+            
+            # The file now exists, so later durable writes only sync its data
+            response = self.client.post("/log?durable=true", json=log_data)
+            assert response.status_code == 200
+            assert len(synced_directories) == 1
+
+    def test_create_log_endpoint_durable_unknown_level(self):
+        """Test POST /log?durable=true with an unknown level creates no logger"""
+        from logger_service.main import service_loggers
+        log_data = {
+            "service": "durable_unknown_service",
+            "level": "TRACE",
+            "message": "Dropped message"
+        }
+        
+        with patch('logger_service.main.BatchedFileHandler') as mock_handler:
+            response = self.client.post("/log?durable=true", json=log_data)
+        
+        assert response.status_code == 200
+        assert "durable_unknown_service" not in service_loggers
+        mock_handler.assert_not_called()
+
+    @patch('logger_service.main.sync_service_log', return_value=False)
+    @patch('logger_service.main.log_to_file')
+    def test_create_log_endpoint_durable_failure(self, mock_log_to_file, mock_sync):
+        """Test POST /log?durable=true reports a failed sync"""
+        log_data = {
+            "service": "durable_service",
+            "level": "INFO",
+            "message": "Durable message"
+        }
+        
+        response = self.client.post("/log?durable=true", json=log_data)
+        
+        assert response.status_code == 503
+        mock_log_to_file.assert_called_once()
+
     @patch('logger_service.main.log_to_file')
     def test_create_log_endpoint_with_timestamp(self, mock_log_to_file):
         """Test POST /log endpoint with provided timestamp"""
@@ -237,6 +572,7 @@ class TestLoggerService:
         data = response.json()
         assert data["status"] == "success"
         assert data["count"] == 2
+        assert response.headers["content-type"] == "application/json"
 
     @patch('logger_service.main.log_to_file')
     def test_create_logs_batch_endpoint_auto_timestamp(self, mock_log_to_file):
@@ -260,12 +596,33 @@ class TestLoggerService:
             assert response.status_code == 200
             mock_datetime.now.assert_called_once()
 
-    @patch('logger_service.main.os.path.exists')
+    @patch('logger_service.main.log_to_file')
+    def test_create_logs_batch_endpoint_shared_timestamp(self, mock_log_to_file):
+        """Test POST /log/batch stamps every entry with one datetime.now() call"""
+        batch_data = {
+            "logs": [
+                {"service": "service1", "level": "INFO", "message": "Message 1"},
+                {"service": "service2", "level": "INFO", "message": "Message 2"},
+                {"service": "service1", "level": "INFO", "message": "Message 3",
+                 "timestamp": "2023-01-01T10:00:00"}
+            ]
+        }
+        
+        with patch('logger_service.main.datetime') as mock_datetime:
+            mock_now = MagicMock()
+            mock_datetime.now.return_value = mock_now
+            
+            response = self.client.post("/log/batch", json=batch_data)
+            
+            assert response.status_code == 200
+            mock_datetime.now.assert_called_once()
+        
+        timestamps = [call.args[0].timestamp for call in mock_log_to_file.call_args_list]
+        assert timestamps == [mock_now, mock_now, datetime(2023, 1, 1, 10, 0, 0)]
+
     @patch('builtins.open', new_callable=mock_open, read_data="2023-01-01 10:00:00 - INFO - Test log 1\n2023-01-01 10:01:00 - ERROR - Test log 2\n")
-    def test_get_logs_endpoint_success(self, mock_file, mock_exists):
+    def test_get_logs_endpoint_success(self, mock_file):
         """Test GET /logs/{service_name} endpoint success case"""
-        mock_exists.return_value = True
-        
         response = self.client.get("/logs/test_service")
         
         assert response.status_code == 200
@@ -274,36 +631,29 @@ class TestLoggerService:
         assert "total" in data
         assert len(data["logs"]) == 2
 
-    @patch('logger_service.main.os.path.exists')
-    def test_get_logs_endpoint_file_not_exists(self, mock_exists):
+    @patch('builtins.open', side_effect=FileNotFoundError("No such file"))
+    def test_get_logs_endpoint_file_not_exists(self, mock_file):
         """Test GET /logs/{service_name} endpoint when log file doesn't exist"""
-        mock_exists.return_value = False
-        
         response = self.client.get("/logs/nonexistent_service")
         
         assert response.status_code == 200
         data = response.json()
         assert data["logs"] == []
         assert data["total"] == 0
+        mock_file.assert_called_once()
 
-    @patch('logger_service.main.os.path.exists')
     @patch('builtins.open', new_callable=mock_open, read_data="2023-01-01 10:00:00 - INFO - Test log 1\n2023-01-01 10:01:00 - ERROR - Test log 2\n2023-01-01 10:02:00 - INFO - Test log 3\n")
-    def test_get_logs_endpoint_with_level_filter(self, mock_file, mock_exists):
+    def test_get_logs_endpoint_with_level_filter(self, mock_file):
         """Test GET /logs/{service_name} endpoint with level filter"""
-        mock_exists.return_value = True
-        
         response = self.client.get("/logs/test_service?level=INFO")
         
         assert response.status_code == 200
         data = response.json()
         assert len(data["logs"]) == 2  # Only INFO logs
 
-    @patch('logger_service.main.os.path.exists')
     @patch('builtins.open', new_callable=mock_open, read_data="Log 1\nLog 2\nLog 3\nLog 4\nLog 5\n")
-    def test_get_logs_endpoint_with_pagination(self, mock_file, mock_exists):
+    def test_get_logs_endpoint_with_pagination(self, mock_file):
         """Test GET /logs/{service_name} endpoint with pagination"""
-        mock_exists.return_value = True
-        
         response = self.client.get("/logs/test_service?limit=2&offset=1")
         
         assert response.status_code == 200
@@ -312,24 +662,30 @@ class TestLoggerService:
         assert data["logs"][0] == "Log 2"
         assert data["logs"][1] == "Log 3"
 
-    @patch('logger_service.main.os.path.exists')
+    @patch('builtins.open', new_callable=mock_open, read_data="Log 1\nLog 2\nLog 3\nLog 4\nLog 5\n")
+    def test_get_logs_endpoint_with_negative_pagination(self, mock_file):
+        """Test GET /logs/{service_name} treats negative offset/limit as list slice bounds"""
+        data = self.client.get("/logs/test_service?offset=-1").json()
+        assert data == {"logs": ["Log 5"], "total": 5}
+        
+        data = self.client.get("/logs/test_service?offset=-3&limit=2").json()
+        assert data == {"logs": ["Log 3", "Log 4"], "total": 5}
+        
+        data = self.client.get("/logs/test_service?limit=-1").json()
+        assert data == {"logs": ["Log 1", "Log 2", "Log 3", "Log 4"], "total": 5}
+
     @patch('builtins.open', side_effect=IOError("File read error"))
-    def test_get_logs_endpoint_file_read_error(self, mock_file, mock_exists):
+    def test_get_logs_endpoint_file_read_error(self, mock_file):
         """Test GET /logs/{service_name} endpoint with file read error"""
-        mock_exists.return_value = True
-        
         response = self.client.get("/logs/test_service")
         
         assert response.status_code == 500
         data = response.json()
         assert "Error retrieving logs" in data["detail"]
 
-    @patch('logger_service.main.os.path.exists')
     @patch('builtins.open', new_callable=mock_open, read_data="Log line 1\nLog line 2\n")
-    def test_get_logs_endpoint_all_parameters(self, mock_file, mock_exists):
+    def test_get_logs_endpoint_all_parameters(self, mock_file):
         """Test GET /logs/{service_name} endpoint with all parameters"""
-        mock_exists.return_value = True
-        
         response = self.client.get(
             "/logs/test_service?level=INFO&start_time=2023-01-01T00:00:00&end_time=2023-01-01T23:59:59&limit=10&offset=0"
         )
@@ -339,6 +695,192 @@ class TestLoggerService:
         assert "logs" in data
         assert "total" in data
 
+    @patch('builtins.open', new_callable=mock_open, read_data="2023-01-01 09:59:59,000 - INFO - Too early\n2023-01-01 10:00:00,000 - INFO - In range\n2023-01-01 10:30:00,000 - ERROR - In range error\n2023-01-01 11:00:01,000 - INFO - Too late\nNo timestamp\n")
+    def test_get_logs_endpoint_with_time_range(self, mock_file):
+        """Test GET /logs/{service_name} endpoint with start_time and end_time"""
+        response = self.client.get(
+            "/logs/test_service?start_time=2023-01-01T10:00:00&end_time=2023-01-01T11:00:00"
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["logs"] == [
+            "2023-01-01 10:00:00,000 - INFO - In range",
+            "2023-01-01 10:30:00,000 - ERROR - In range error",
+        ]
+
+    @patch('builtins.open', new_callable=mock_open, read_data="2023-01-01 10:00:00,100 - INFO - Before start\n2023-01-01 10:00:00,900 - INFO - At start\n2023-01-01 10:00:01,200 - INFO - At end\n2023-01-01 10:00:01,201 - INFO - After end\n")
+    def test_get_logs_endpoint_with_sub_second_time_range(self, mock_file):
+        """Test GET /logs/{service_name} compares time bounds to the millisecond"""
+        response = self.client.get(
+            "/logs/test_service?start_time=2023-01-01T10:00:00.900&end_time=2023-01-01T10:00:01.200"
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["logs"] == [
+            "2023-01-01 10:00:00,900 - INFO - At start",
+            "2023-01-01 10:00:01,200 - INFO - At end",
+        ]
+
+    def test_get_logs_endpoint_invalid_time(self):
+        """Test GET /logs/{service_name} endpoint with an unparseable start_time"""
+        response = self.client.get("/logs/test_service?start_time=yesterday")
+        
+        assert response.status_code == 400
+        assert "start_time" in response.json()["detail"]
+
+    def _write_service_log(self, service_name, content):
+        with open(os.path.join(self.temp_dir, f"{service_name}.log"), "w") as f:
+            f.write(content)
+
+    def test_get_raw_logs_endpoint(self):
+        """Test GET /logs/{service_name}/raw returns the whole file as text"""
+        content = "2023-01-01 10:00:00,000 - INFO - Line 1\n2023-01-01 10:01:00,000 - ERROR - Line 2\n"
+        self._write_service_log("raw_service", content)
+        
+        response = self.client.get("/logs/raw_service/raw")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text == content
+
+    def test_get_raw_logs_endpoint_tail(self):
+        """Test GET /logs/{service_name}/raw?tail=N starts at a full line"""
+        self._write_service_log("raw_service", "Line 1\nLine 2\nLine 3\n")
+        
+        response = self.client.get("/logs/raw_service/raw?tail=10")
+        assert response.status_code == 200
+        assert response.text == "Line 3\n"
+        
+        response = self.client.get("/logs/raw_service/raw?tail=14")
+        assert response.text == "Line 2\nLine 3\n"
+        
+        response = self.client.get("/logs/raw_service/raw?tail=1000")
+        assert response.text == "Line 1\nLine 2\nLine 3\n"
+
+    def test_get_raw_logs_endpoint_growing_file(self):
+        """Test GET /logs/{service_name}/raw stops at the size the file had when opened"""
+        self._write_service_log("raw_service", "Line 1\nLine 2\n")
+        log_file = os.path.join(self.temp_dir, "raw_service.log")
+        real_iter_log_file = iter_log_file
+
+        def iter_while_appending(*args, **kwargs):
+            # Another record lands after the response has been set up
+            with open(log_file, "a") as f:
+                f.write("Line 3\n")
+            yield from real_iter_log_file(*args, **kwargs)
+
+        with patch('logger_service.main.iter_log_file', iter_while_appending):
+            response = self.client.get("/logs/raw_service/raw")
+        
+        assert response.status_code == 200
+        assert response.headers["content-length"] == "14"
+        assert response.text == "Line 1\nLine 2\n"
+
+    def test_get_raw_logs_endpoint_not_a_file(self):
+        """Test GET /logs/{service_name}/raw when the log path is not a regular file"""
+        os.mkdir(os.path.join(self.temp_dir, "dir_service.log"))
+        
+        response = self.client.get("/logs/dir_service/raw")
+        
+        assert response.status_code == 404
+
+    def test_get_raw_logs_endpoint_not_found(self):
+        """Test GET /logs/{service_name}/raw when log file doesn't exist"""
+        response = self.client.get("/logs/nonexistent_service/raw")
+        
+        assert response.status_code == 404
+
+    def test_binary_log_roundtrip(self):
+        """Test POST /log/binary records can be read back from GET /logs/{service_name}/binary"""
+        entries = [
+            {"service": "binary_service", "level": "INFO", "message": "Message 1",
+             "timestamp": "2023-01-01T10:00:00"},
+            {"service": "binary_service", "level": "ERROR", "message": "Message 2",
+             "timestamp": "2023-01-01T10:01:00"},
+            {"service": "binary_service", "level": "info", "message": "Message 3",
+             "timestamp": "2023-01-01T10:02:00.123000"},
+        ]
+        for entry in entries:
+            response = self.client.post("/log/binary", json=entry)
+            assert response.status_code == 200
+            assert response.json()["status"] == "success"
+        
+        assert os.path.getsize(os.path.join(self.temp_dir, "binary_service.bin")) == 3 * 256
+        
+        data = self.client.get("/logs/binary_service/binary").json()
+        assert data["total"] == 3
+        assert [log["message"] for log in data["logs"]] == ["Message 1", "Message 2", "Message 3"]
+        assert data["logs"][0] == {
+            "timestamp": "2023-01-01T10:00:00",
+            "level": "INFO",
+            "message": "Message 1",
+        }
+        assert data["logs"][2]["timestamp"] == "2023-01-01T10:02:00.123000"
+        
+        data = self.client.get("/logs/binary_service/binary?level=INFO&offset=1&limit=5").json()
+        assert data["total"] == 2
+        assert [log["message"] for log in data["logs"]] == ["Message 3"]
+
+    def test_binary_log_truncates_long_message(self):
+        """Test binary records keep at most 245 bytes of the message"""
+        self.client.post("/log/binary", json={
+            "service": "binary_service", "level": "WARNING", "message": "x" * 300
+        })
+        
+        data = self.client.get("/logs/binary_service/binary").json()
+        assert data["total"] == 1
+        assert data["logs"][0]["level"] == "WARNING"
+        assert data["logs"][0]["message"] == "x" * 245
+
+    def test_binary_log_pre_epoch_timestamp(self):
+        """Test binary records keep timestamps from before 1970"""
+        response = self.client.post("/log/binary", json={
+            "service": "binary_service", "level": "INFO", "message": "Old message",
+            "timestamp": "1960-01-01T00:00:00.250000"
+        })
+        assert response.status_code == 200
+        
+        data = self.client.get("/logs/binary_service/binary").json()
+        assert data["total"] == 1
+        assert data["logs"][0]["timestamp"] == "1960-01-01T00:00:00.250000"
+
+    def test_binary_log_timestamp_out_of_range(self):
+        """Test POST /log/binary rejects timestamps the record cannot hold"""
+        response = self.client.post("/log/binary", json={
+            "service": "binary_service", "level": "INFO", "message": "Far future",
+            "timestamp": "9999-01-01T00:00:00"
+        })
+        
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "timestamp"]
+        assert not os.path.exists(os.path.join(self.temp_dir, "binary_service.bin"))
+
+    def test_get_binary_logs_endpoint_not_exists(self):
+        """Test GET /logs/{service_name}/binary when no binary log exists"""
+        response = self.client.get("/logs/nonexistent_service/binary")
+        
+        assert response.status_code == 200
+        assert response.json() == {"logs": [], "total": 0}
+
+    def test_get_binary_logs_endpoint_negative_pagination(self):
+        """Test GET /logs/{service_name}/binary rejects a negative offset or limit"""
+        self.client.post("/log/binary", json={
+            "service": "binary_service", "level": "INFO", "message": "Message 1"
+        })
+        
+        for query in ("offset=-1", "limit=-1", "level=INFO&offset=-1"):
+            response = self.client.get(f"/logs/binary_service/binary?{query}")
+            assert response.status_code == 422
+
+    def test_get_binary_logs_endpoint_invalid_level(self):
+        """Test GET /logs/{service_name}/binary with an unknown level"""
+        response = self.client.get("/logs/binary_service/binary?level=VERBOSE")
+        
+        assert response.status_code == 400
+
     def test_log_entry_model_validation(self):
         """Test LogEntry model validation"""
         # Valid log entry
@@ -403,5 +945,15 @@ class TestLoggerService:
         response = self.client.post("/log/batch", json=invalid_data)
         assert response.status_code == 422  # Validation error
 
+    def test_invalid_batch_json(self):
+        """Test POST /log/batch with a body that is not valid JSON"""
+        response = self.client.post(
+            "/log/batch",
+            content=b'{"logs": [',
+            headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--cov=logger_service", "--cov-report=term-missing"])